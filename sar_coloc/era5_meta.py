@@ -2,14 +2,25 @@ import os
 import numpy as np
 from .tools import open_nc, correct_dataset, parse_date
 
+# name of the longitude and latitude dimensions for each ERA 5 resolution
+LONGITUDE_NAMES = {0.25: 'longitude025', 0.5: 'longitude050'}
+LATITUDE_NAMES = {0.25: 'latitude025', 0.5: 'latitude050'}
+
 
 class GetEra5Meta:
     def __init__(self, product_path, listing=True):
         self.product_path = product_path
         self.product_name = os.path.basename(self.product_path)
         self.dataset = None
+        self._lon_names = {}
+        self._lat_names = {}
         if not listing:
-            self.dataset = open_nc(product_path).load()
+            # data is lazily loaded, hourly fields are only read when they are sliced
+            self.dataset = open_nc(product_path, chunks={'time': 1})
+            self._lon_names = {resolution: name for resolution, name in LONGITUDE_NAMES.items()
+                               if name in self.dataset.dims}
+            self._lat_names = {resolution: name for resolution, name in LATITUDE_NAMES.items()
+                               if name in self.dataset.dims}
             self.dataset = correct_dataset(self.dataset, lon_name=self.longitude_name(0.25))
             self.dataset = correct_dataset(self.dataset, lon_name=self.longitude_name(0.5))
 
@@ -49,21 +60,19 @@ class GetEra5Meta:
         Parameters
         ----------
         resolution: float
-            Specified resolution for the dimension (dimension must exist in the dataset with the name
-            `'longitude%s' % (str(resolution).replace('.', ''))` )
+            Specified resolution for the dimension (0.25 or 0.5, dimension must exist in the dataset with the name
+            given in `LONGITUDE_NAMES`)
 
         Returns
         -------
         str
             longitude name
         """
-        str_resolution = str(resolution).replace('.', '')
-        str_resolution += '0' * (3 - len(str_resolution))  # Add 0 to have a str of 3 characters
-        name = f"longitude{str_resolution}"
-        if name in self.dataset.dims:
-            return name
+        if resolution in self._lon_names:
+            return self._lon_names[resolution]
         else:
-            raise ValueError(f"{name} wasn't found in the dataset. Please verify the resolution is correct")
+            raise ValueError(f"Longitude with a resolution of {resolution} wasn't found in the dataset. Please verify "
+                             f"the resolution is correct")
 
     def latitude_name(self, resolution):
         """
@@ -73,21 +82,19 @@ class GetEra5Meta:
         Parameters
         ----------
         resolution: float
-            Specified resolution for the dimension (dimension must exist in the dataset with the name
-            `'latitude%s' % (str(resolution).replace('.', ''))` )
+            Specified resolution for the dimension (0.25 or 0.5, dimension must exist in the dataset with the name
+            given in `LATITUDE_NAMES`)
 
         Returns
         -------
         str
             longitude name
         """
-        str_resolution = str(resolution).replace('.', '')
-        str_resolution += '0' * (3 - len(str_resolution))  # Add 0 to have a str of 3 characters
-        name = f"latitude{str_resolution}"
-        if name in self.dataset.dims:
-            return name
+        if resolution in self._lat_names:
+            return self._lat_names[resolution]
         else:
-            raise ValueError(f"{name} wasn't found in the dataset. Please verify the resolution is correct")
+            raise ValueError(f"Latitude with a resolution of {resolution} wasn't found in the dataset. Please verify "
+                             f"the resolution is correct")
 
     @property
     def time_name(self):
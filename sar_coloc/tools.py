@@ -1,13 +1,25 @@
 import os
 import glob
+import concurrent.futures
+import fnmatch
+import functools
+import importlib
+import re
 import xarray as xr
 from shapely import wkt, Polygon
 import numpy as np
 import fsspec
 import itertools
-from datetime import datetime
 from xsar.raster_readers import resource_strftime
 
+_HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+# (module, class) of the metadata class for each SAR satellite
+_SAR_META_CLASSES = {satellite: ('sar_meta', 'GetSarMeta')
+                     for satellite in ['RS2', 'S1A', 'S1B', 'RCM1', 'RCM2', 'RCM3']}
+# xsar metadata class of each SAR sensor, in order of priority when several sensors are in a dataset id
+_SAR_META_CLASS_NAMES = {'S1': 'Sentinel1Meta', 'RS2': 'RadarSat2Meta', 'RCM': 'RcmMeta'}
+_SAR_SENSOR_PATTERN = re.compile('|'.join(_SAR_META_CLASS_NAMES))
+
 
 def unique(iterable):
     return list(dict.fromkeys(iterable))
@@ -15,6 +27,10 @@ def unique(iterable):
 
 def determine_dims(coords):
     all_dims = [coord.dims for coord in coords.variables.values()]
+    distinct_dims = set(all_dims)
+    # coordinates of regular grids usually share the same dimensions
+    if len(distinct_dims) == 1:
+        return list(distinct_dims.pop())
 
     return unique(itertools.chain.from_iterable(all_dims))
 
@@ -44,22 +60,84 @@ def get_acquisition_root_paths(db_name):
 
 
 def call_meta_class(file, listing=True):
-    sar_satellites = ['RS2', 'S1A', 'S1B', 'RCM1', 'RCM2', 'RCM3']
     basename = os.path.basename(file).upper()
-    if basename.split('_')[0].split('-')[0] in sar_satellites:
-        from .sar_meta import GetSarMeta
-        return GetSarMeta(file, listing=listing)
-    elif basename.startswith('SM_'):
-        from .smos_meta import GetSmosMeta
-        return GetSmosMeta(file, listing=listing)
-    elif basename.split('_')[3] == 'HY2':
-        from .hy2_meta import GetHy2Meta
-        return GetHy2Meta(file, listing=listing)
-    elif basename.startswith('ERA_5'):
-        from .era5_meta import GetEra5Meta
-        return GetEra5Meta(file, listing=listing)
-    else:
-        raise ValueError(f"Can't recognize satellite type from product {basename}")
+    split_basename = basename.split('_')
+    module_name, class_name = _SAR_META_CLASSES.get(split_basename[0].split('-')[0], (None, None))
+    if module_name is None:
+        if basename.startswith('SM_'):
+            module_name, class_name = 'smos_meta', 'GetSmosMeta'
+        elif split_basename[3] == 'HY2':
+            module_name, class_name = 'hy2_meta', 'GetHy2Meta'
+        elif basename.startswith('ERA_5'):
+            module_name, class_name = 'era5_meta', 'GetEra5Meta'
+        else:
+            raise ValueError(f"Can't recognize satellite type from product {basename}")
+    # meta modules import this one, so they are imported at the first call (then found in `sys.modules`)
+    meta_class = getattr(importlib.import_module(f".{module_name}", __package__), class_name)
+    return meta_class(file, listing=listing)
+
+
+@functools.lru_cache(maxsize=4096)
+def _list_dir(path):
+    """
+    List a directory once. The listing is cached, so the directories shared by several dates or levels of a research
+    are only read one time.
+
+    Parameters
+    ----------
+    path: str
+        Directory path
+
+    Returns
+    -------
+    Tuple[Tuple[str, bool]]
+        Name of each entry and True if it is a directory. Empty if the directory doesn't exist or can't be read.
+    """
+    try:
+        with os.scandir(path) as entries:
+            return tuple((entry.name, entry.is_dir()) for entry in entries)
+    except OSError:
+        return ()
+
+
+def _scan_levels(root, patterns):
+    """
+    Walk a directory tree level by level, keeping at each level the entries whose name matches the corresponding
+    fnmatch pattern. It is equivalent to `glob.glob(os.path.join(root, *patterns))`, but the file type given by the
+    directory read is reused, so no additional `stat` is made on each entry, and directory listings are cached
+    (see `_list_dir`).
+
+    Parameters
+    ----------
+    root: str
+        Root path of the research. It can contain wildcards, which are resolved as additional levels.
+    patterns: List[str]
+        fnmatch pattern for each level under the root
+
+    Returns
+    -------
+    List[str]
+        Matching paths
+    """
+    # archives are on POSIX file systems, so paths are split and joined on '/' directly rather than by os.path
+    root_parts = root.split('/')
+    # literal part of the root, before the first wildcard
+    depth = next((i for i, part in enumerate(root_parts) if glob.has_magic(part)), len(root_parts))
+    paths = ['/'.join(root_parts[:depth]) or '/']
+    levels = [part for part in root_parts[depth:] if part] + list(patterns)
+    for index, pattern in enumerate(levels):
+        is_leaf = index == len(levels) - 1
+        matching_paths = []
+        for path in paths:
+            prefix = path if path.endswith('/') else f"{path}/"
+            for name, is_dir in _list_dir(path):
+                # like glob, hidden entries are only matched by an explicit pattern
+                if name.startswith('.') and not pattern.startswith('.'):
+                    continue
+                if fnmatch.fnmatchcase(name, pattern) and (is_leaf or is_dir):
+                    matching_paths.append(prefix + name)
+        paths = matching_paths
+    return paths
 
 
 def get_all_comparison_files(start_date, stop_date, db_name='SMOS'):
@@ -96,97 +174,86 @@ def get_all_comparison_files(start_date, stop_date, db_name='SMOS'):
             Latest generation SMOS paths
 
         """
+        last_generation_files = {}
+        for file in files_list:
+            split_basename = os.path.basename(file).split('_')
+            # prefix is the same when only the generation is different
+            prefix = '_'.join(split_basename[:-2])
+            generation = int(split_basename[-2])
+            # if the generation is greater (or equal, the last listed file is kept), it becomes the reference
+            if prefix not in last_generation_files or generation >= last_generation_files[prefix][0]:
+                last_generation_files[prefix] = (generation, file)
+        return [file for generation, file in last_generation_files.values()]
+
+    def overlaps_research(start, stop):
+        """
+        Express if an acquisition overlaps the research dates
 
-        def extract_smos_sort_keys(string):
-            """
-            From a SMOS path, extract the orbit (Ascending or Descending), the date and the generation number. It is
-            used to sort a list of SMOS paths
-
-            Parameters
-            ----------
-            string: str
-                SMOS path
-
-            Returns
-            -------
-            (str, int, int)
-                Primary and secondary sort keys (orbit, date, generation number)
-            """
-            basename = os.path.basename(string)
-            key1 = basename.split('_')[-5]
-            key2 = int(basename.split('_')[-4])
-            key3 = int(basename.split('_')[-2])
-            return key1, key2, key3
-
-        if len(files_list) == 0:
-            return files_list
-        else:
-            final_files = []
-            sorted_files = sorted(files_list, key=extract_smos_sort_keys)
-            last_generation_file = sorted_files[0]
-            for index, file in enumerate(sorted_files):
-                # prefix is the same when only the generation is different
-                prefix = '_'.join(os.path.basename(file).split('_')[:-2])
-                if prefix == '_'.join(os.path.basename(last_generation_file).split('_')[:-2]):
-                    # if the generation is greater, we increase the reference generation
-                    if extract_smos_sort_keys(file)[2] >= extract_smos_sort_keys(last_generation_file)[2]:
-                        last_generation_file = file
-                else:
-                    final_files.append(last_generation_file)
-                    last_generation_file = file
-                # The last files isn't added when it is a new product, so we add it
-                if index == len(sorted_files) - 1:
-                    final_files.append(file)
-            return final_files
+        Parameters
+        ----------
+        start: numpy.datetime64
+            Start date of the acquisition
+        stop: numpy.datetime64
+            Stop date of the acquisition
+
+        Returns
+        -------
+        bool
+            True if the acquisition overlaps `[start_date, stop_date]`
+        """
+        return not ((stop < start_date) or (start > stop_date))
 
     root_paths = get_acquisition_root_paths(db_name)
+    # archives are updated between two researches, so listings are only shared inside a research
+    _list_dir.cache_clear()
     files = []
     schemes = date_schemes(start_date, stop_date)
     if db_name == 'SMOS':
         # get all netcdf files which contain the days in schemes
         for root_path in root_paths:
             for scheme in schemes:
-                files += glob.glob(os.path.join(root_path, schemes[scheme]['year'],
-                                                schemes[scheme]['dayOfYear'], f"*{scheme}*nc"))
+                files += _scan_levels(root_path, [schemes[scheme]['year'], schemes[scheme]['dayOfYear'],
+                                                  f"*{scheme}*nc"])
         files = get_last_generation_files(files)
     elif db_name == 'HY2':
         # get all netcdf files which contain the days in schemes
         for root_path in root_paths:
             for scheme in schemes:
-                files += glob.glob(os.path.join(root_path, schemes[scheme]['year'],
-                                                schemes[scheme]['dayOfYear'], f"*{scheme}*nc"))
-        # remove files for which hour doesn't correspond to the selected times
-        for f in files.copy():
-            start_hy, stop_hy = extract_start_stop_dates_from_hy(f)
-            if (stop_hy < start_date) or (start_hy > stop_date):
-                files.remove(f)
+                files += _scan_levels(root_path, [schemes[scheme]['year'], schemes[scheme]['dayOfYear'],
+                                                  f"*{scheme}*nc"])
+        # remove files for which hour doesn't correspond to the selected times. Files are read from threads:
+        # xarray serializes the HDF5 / netCDF-C calls with a global lock, so only the waits outside the library
+        # (ex : file system latency) overlap
+        if len(files) > 0:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+                files_dates = list(executor.map(extract_start_stop_dates_from_hy, files))
+            files = [f for f, dates in zip(files, files_dates) if overlaps_research(*dates)]
     elif db_name == 'S1':
         for level in root_paths:
             for root_path in root_paths[level]:
                 for scheme in schemes:
+                    year, day_of_year = schemes[scheme]['year'], schemes[scheme]['dayOfYear']
                     if level == 'L1':
-                        files += glob.glob(os.path.join(root_path, '*', '*', schemes[scheme]['year'],
-                                                        schemes[scheme]['dayOfYear'], f"S1*{scheme}*SAFE"))
+                        files += _scan_levels(root_path, ['*', '*', year, day_of_year, f"S1*{scheme}*SAFE"])
                     elif level == 'L2':
-                        files += glob.glob(os.path.join(root_path, '*', '*', '*', schemes[scheme]['year'],
-                                                        schemes[scheme]['dayOfYear'], f"S1*{scheme}*SAFE", "*owi*.nc"))
+                        files += _scan_levels(root_path, ['*', '*', '*', year, day_of_year, f"S1*{scheme}*SAFE",
+                                                          "*owi*.nc"])
     elif db_name == 'RS2':
         for level in root_paths:
             for root_path in root_paths[level]:
                 for scheme in schemes:
+                    year, day_of_year = schemes[scheme]['year'], schemes[scheme]['dayOfYear']
                     if level == 'L1':
-                        files += glob.glob(os.path.join(root_path, '*', schemes[scheme]['year'],
-                                                        schemes[scheme]['dayOfYear'], f"RS2*{scheme}*"))
+                        files += _scan_levels(root_path, ['*', year, day_of_year, f"RS2*{scheme}*"])
                     elif level == 'L2':
-                        files += glob.glob(os.path.join(root_path, '*', schemes[scheme]['year'],
-                                                        schemes[scheme]['dayOfYear'], f"RS2*{scheme}*", "*owi*.nc"))
+                        files += _scan_levels(root_path, ['*', year, day_of_year, f"RS2*{scheme}*", "*owi*.nc"])
     elif db_name == 'RCM':
         for level in root_paths:
             for root_path in root_paths[level]:
                 for scheme in schemes:
                     if level == 'L1':
-                        files += glob.glob(os.path.join(root_path, schemes[scheme]['year'],
-                                                        schemes[scheme]['dayOfYear'], f"RS2*{scheme}*"))
+                        files += _scan_levels(root_path, [schemes[scheme]['year'], schemes[scheme]['dayOfYear'],
+                                                          f"RS2*{scheme}*"])
                     elif level == 'L2':
                         # TODO : search files when RCM level 2 exist
                         pass
@@ -195,10 +262,7 @@ def get_all_comparison_files(start_date, stop_date, db_name='SMOS'):
             files = get_nearest_era5_files(start_date, stop_date, root_path)
 
     if db_name in ['S1', 'RS2', 'RCM']:
-        for f in files.copy():
-            start, stop = extract_start_stop_dates_from_sar(f)
-            if (stop < start_date) or (start > stop_date):
-                files.remove(f)
+        files = [f for f in files if overlaps_research(*extract_start_stop_dates_from_sar(f))]
     return files
 
 
@@ -222,21 +286,43 @@ def get_nearest_era5_files(start_date, stop_date, resource, step=1):
     list[str]
         Concerned ERA5 files
     """
-    files = []
-    date = start_date
-    while date < stop_date:
-        datetime_date = date.tolist()
-        closest_date, filename = resource_strftime(resource, step=step, date=datetime_date)
-        if filename not in files:
-            files.append(filename)
-        date += np.timedelta64(step, 'm')
-    return files
+    # each date is rounded to the closest step by `resource_strftime`, so sampling the research every `step` hours
+    # (and at its last whole minute after the start date, i.e. the last date of a per-minute walk) is enough to get
+    # all the concerned files
+    dates = np.arange(start_date, stop_date, np.timedelta64(step, 'h'))
+    if dates.size > 0:
+        minute = np.timedelta64(1, 'm')
+        last_date = start_date + ((stop_date - start_date - np.timedelta64(1, 'us')) // minute) * minute
+        dates = np.append(dates, last_date)
+    files = dict.fromkeys(resource_strftime(resource, step=step, date=date)[1]
+                          for date in dates.astype('datetime64[s]').tolist())
+    return list(files)
+
+
+def _longitude_range(lon_values):
+    """
+    Range of longitude values, computed in a single pass by `numpy.ptp`. Like xarray reductions, NaN values are
+    ignored (then computed with a second pass)
+
+    Parameters
+    ----------
+    lon_values: numpy.ndarray
+        Longitude values
+
+    Returns
+    -------
+    float
+        maximum - minimum longitude
+    """
+    lon_range = np.ptp(lon_values)
+    if np.isnan(lon_range):
+        lon_range = np.nanmax(lon_values) - np.nanmin(lon_values)
+    return lon_range
 
 
 def cross_antemeridian(dataset):
     """True if footprint cross antemeridian"""
-    return ((np.max(dataset.lon) - np.min(
-        dataset.lon)) > 180).item()
+    return bool(_longitude_range(dataset.lon.values) > 180)
 
 
 def correct_dataset(dataset, lon_name='lon'):
@@ -259,27 +345,41 @@ def correct_dataset(dataset, lon_name='lon'):
 
     def cross_antemeridian(ds):
         """True if footprint cross antemeridian"""
-        return ((np.max(ds[lon_name]) - np.min(
-            ds[lon_name])) > 180).item()
+        return bool(_longitude_range(ds[lon_name].values) > 180)
 
     lon = dataset[lon_name]
     if cross_antemeridian(dataset):
         lon = (lon + 180) % 360
     dataset = dataset.assign_coords(**{lon_name: lon - 180})
     if dataset[lon_name].ndim == 1:
-        dataset = dataset.sortby(lon_name)
+        lon_values = dataset[lon_name].values
+        # indexes after which longitude doesn't increase (NaN included)
+        unsorted_indexes = np.flatnonzero(~(np.diff(lon_values) > 0))
+        if len(unsorted_indexes) == 0:
+            # already sorted
+            pass
+        elif len(unsorted_indexes) == 1 and lon_values[-1] < lon_values[0] and \
+                lon_values[unsorted_indexes[0] + 1] < lon_values[unsorted_indexes[0]]:
+            # sorted longitudes that wrap around once (ex : after the shift of a regular grid), a roll is enough
+            dataset = dataset.roll({lon_name: -(unsorted_indexes[0] + 1)}, roll_coords=True)
+        else:
+            dataset = dataset.sortby(lon_name)
     return dataset
 
 
 def date_schemes(start_date, stop_date):
+    days = np.arange(start_date.astype('datetime64[D]'), stop_date.astype('datetime64[D]') + 1)
+    if days.size == 0:
+        return {}
+    first_days_of_year = days.astype('datetime64[Y]')
+    first_days_of_month = days.astype('datetime64[M]')
+    str_schemes = np.char.replace(days.astype(str), '-', '')
+    years = first_days_of_year.astype(str)
+    months = np.char.zfill(((first_days_of_month - first_days_of_year).astype(int) + 1).astype(str), 2)
+    days_of_year = np.char.zfill(((days - first_days_of_year).astype(int) + 1).astype(str), 3)
     schemes = {}
-    date = start_date
-    while date.astype('datetime64[D]') <= stop_date.astype('datetime64[D]'):
-        scheme = str(date.astype('datetime64[D]')).replace('-', '')
-        year = str(date.astype('datetime64[Y]'))
-        month = str(date.astype('datetime64[M]')).split('-')[1]
-        day_of_year = date.astype(datetime).strftime('%j')
-        date += np.timedelta64(1, 'D')
+    for scheme, year, day_of_year, month in zip(str_schemes.tolist(), years.tolist(), days_of_year.tolist(),
+                                                months.tolist()):
         tmp_dic = {'year': year,
                    'dayOfYear': day_of_year,
                    'month': month}
@@ -287,9 +387,11 @@ def date_schemes(start_date, stop_date):
     return schemes
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_start_stop_dates_from_hy(product_path):
-    ds = open_nc(product_path)
-    unique_time = np.unique(ds.time)
+    # only the time is decoded and read
+    with open_nc(product_path, variables=['time']) as ds:
+        unique_time = np.unique(ds.time)
     return min(unique_time), max(unique_time)
 
 
@@ -311,8 +413,15 @@ def parse_date(date):
         raise ValueError('Argument date must be a string')
     if len(date) != 14:
         raise ValueError("Date isn't at the good format, please use the format %Y%Y%Y%Y%M%M%D%D%H%H%M%M%S%S")
-    # formatted_date_string = f"{date[0:4]}-{date[4:6]}-{date[6:8]}T{date[8:10]}:{date[10:12]}:{date[12:16]}"
-    return np.datetime64(datetime.strptime(date, '%Y%m%d%H%M%S'))
+    return _parse_date(date)
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_date(date):
+    """Cached parsing of a valid date string (see `parse_date`)"""
+    # numpy directly parses the ISO 8601 format, without an intermediate datetime object
+    formatted_date_string = f"{date[0:4]}-{date[4:6]}-{date[6:8]}T{date[8:10]}:{date[10:12]}:{date[12:14]}"
+    return np.datetime64(formatted_date_string, 's')
 
 
 def extract_start_stop_dates_from_sar(product_path):
@@ -330,6 +439,12 @@ def extract_start_stop_dates_from_sar(product_path):
     np.datetime64, np.datetime64
         Tuple that contains the start and the stop dates
     """
+    return _parse_basename(os.path.basename(product_path))
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_basename(basename):
+    """Cached start and stop dates of a SAR product basename (see `extract_start_stop_dates_from_sar`)"""
     separators = {
         'L1': '_',
         'L2': '-'
@@ -349,7 +464,6 @@ def extract_start_stop_dates_from_sar(product_path):
         'date': 5,
         'time': 6
     }
-    basename = os.path.basename(product_path)
     upper_basename = basename.upper()
     # level 2 products
     if basename.endswith('.nc'):
@@ -389,18 +503,33 @@ def call_sar_meta(dataset_id):
     xsar.Sentinel1Meta | xsar.RadarSat2Meta | xsar.RcmMeta
         Object that contains the metadata
     """
-    if isinstance(dataset_id, str) and "S1" in dataset_id:
-        from xsar import Sentinel1Meta
-        sar_meta = Sentinel1Meta(dataset_id)
-    elif isinstance(dataset_id, str) and "RS2" in dataset_id:
-        from xsar import RadarSat2Meta
-        sar_meta = RadarSat2Meta(dataset_id)
-    elif isinstance(dataset_id, str) and "RCM" in dataset_id:
-        from xsar import RcmMeta
-        sar_meta = RcmMeta(dataset_id)
-    else:
+    sensor = None
+    if isinstance(dataset_id, str):
+        # sensors found in one scan of the dataset id, then taken in order of priority
+        found_sensors = set(_SAR_SENSOR_PATTERN.findall(dataset_id))
+        sensor = next((sensor for sensor in _SAR_META_CLASS_NAMES if sensor in found_sensors), None)
+    if sensor is None:
         raise TypeError("Unknown dataset id type from %s" % str(dataset_id))
-    return sar_meta
+    return _load_sar_meta_class(sensor)(dataset_id)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_sar_meta_class(sensor):
+    """
+    Import the xsar metadata class of a SAR sensor. The class is cached, so the import is only made at the first call.
+
+    Parameters
+    ----------
+    sensor: str
+        SAR sensor (S1, RS2 or RCM)
+
+    Returns
+    -------
+    type
+        xsar.Sentinel1Meta | xsar.RadarSat2Meta | xsar.RcmMeta
+    """
+    import xsar
+    return getattr(xsar, _SAR_META_CLASS_NAMES[sensor])
 
 
 def find_l2_nc(product_path):
@@ -431,8 +560,7 @@ def open_l2(product_path):
         Level 2 SAR product
     """
     nc_product = find_l2_nc(product_path)
-    fs = fsspec.filesystem("file")
-    return xr.open_dataset(fs.open(nc_product), engine='h5netcdf')
+    return _open_dataset(nc_product, engine='h5netcdf')
 
 
 def convert_str_to_polygon(poly_str):
@@ -471,30 +599,94 @@ def get_l2_footprint(dataset):
         return convert_str_to_polygon(dataset.attrs['footprint'])
     else:
         footprint_dict = {}
+        # first and last indexes of each dimension, so corners are read in one indexing
+        az_indexes = [0, dataset.sizes['owiAzSize'] - 1]
+        ra_indexes = [0, dataset.sizes['owiRaSize'] - 1]
         for ll in ['owiLon', 'owiLat']:
-            footprint_dict[ll] = [
-                dataset[ll].isel(owiAzSize=a, owiRaSize=x).values for a, x in [(0, 0), (0, -1), (-1, -1), (-1, 0)]
-            ]
+            corners_ll = dataset[ll].isel(owiAzSize=az_indexes, owiRaSize=ra_indexes) \
+                .transpose('owiAzSize', 'owiRaSize').values
+            footprint_dict[ll] = [corners_ll[a, x] for a, x in [(0, 0), (0, -1), (-1, -1), (-1, 0)]]
         corners = list(zip(footprint_dict['owiLon'], footprint_dict['owiLat']))
         return Polygon(corners)
 
 
-def open_nc(product_path):
+def _is_remote(product_path):
+    """True if the path is an url (`protocol://...`) that must be opened through fsspec"""
+    return "://" in product_path
+
+
+def _open_dataset(product_path, **kwargs):
+    """
+    Open a dataset using `xarray.open_dataset`. Local paths are given directly to the backend, so that it reads the
+    file natively. Remote paths are opened as file objects with fsspec.
+
+    Parameters
+    ----------
+    product_path: str
+        Local path or url of the product
+    kwargs: dict
+        `xarray.open_dataset` keyword arguments
+
+    Returns
+    -------
+    xarray.Dataset
+        Product content
+    """
+    if _is_remote(product_path):
+        return xr.open_dataset(fsspec.open(product_path, 'rb').open(), **kwargs)
+    else:
+        return xr.open_dataset(product_path, **kwargs)
+
+
+def _netcdf_engine(product_path):
+    """
+    Choose the `xarray.open_dataset` engine from the file signature: `h5netcdf` for netCDF4 (HDF5) files, the
+    default engine otherwise (ex : netCDF3, not readable by `h5netcdf`)
+
+    Parameters
+    ----------
+    product_path: str
+        Absolute path or url to the netcdf
+
+    Returns
+    -------
+    str | None
+        engine name
+    """
+    with (fsspec.open(product_path, 'rb') if _is_remote(product_path) else open(product_path, 'rb')) as f:
+        signature = f.read(len(_HDF5_SIGNATURE))
+    if signature == _HDF5_SIGNATURE:
+        return 'h5netcdf'
+    else:
+        return None
+
+
+def open_nc(product_path, variables=None, chunks=None):
     """
-    Open a netcdf file using `xarray.open_dataset`
+    Open a netcdf file using `xarray.open_dataset`. The file is opened without CF decoding, which is then only
+    applied on the selected variables.
 
     Parameters
     ----------
     product_path: str
         Absolute path to the netcdf
+    variables: List[str] | None
+        Variables to keep in the dataset. All variables by default.
+    chunks: dict | None
+        If specified, the data is lazily loaded as dask arrays with these chunks (see `xarray.open_dataset`)
 
     Returns
     -------
     xarray.Dataset
         netcdf content
     """
-    fs = fsspec.filesystem("file")
-    return xr.open_dataset(fs.open(product_path))
+    dataset = _open_dataset(product_path, engine=_netcdf_engine(product_path), decode_cf=False, chunks=chunks)
+    if variables is not None:
+        subset = dataset[variables]
+        # selecting variables doesn't keep the link to the file, which must still be closed with the subset
+        subset.set_close(dataset.close)
+        dataset = subset
+    return xr.decode_cf(dataset)
 
 
 def open_smos_file(product_path):
@@ -511,5 +703,4 @@ def open_smos_file(product_path):
     xarray.Dataset
         Smos product
     """
-    fs = fsspec.filesystem("file")
-    return xr.open_dataset(fs.open(product_path), engine='h5netcdf')
+    return _open_dataset(product_path, engine='h5netcdf')
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""Tests for `sar_coloc.tools` module."""
+
+import glob
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from sar_coloc.tools import correct_dataset, get_nearest_era5_files, _scan_levels
+
+ERA5_RESOURCE = '/era_5-copernicus__%Y%m%d.nc'
+
+
+@pytest.mark.parametrize(
+    "start_date, stop_date, expected_days",
+    [
+        # last minute of the research is 23:30:30, rounded to the next day
+        ('2023-01-01T23:00:30', '2023-01-01T23:30:45', ['20230101', '20230102']),
+        # research shorter than a minute
+        ('2023-01-01T23:30:00', '2023-01-01T23:30:30', ['20230102']),
+        ('2023-01-01T10:00:00', '2023-01-03T02:00:00', ['20230101', '20230102', '20230103']),
+        ('2023-01-01T10:00:00', '2023-01-01T10:00:00', []),
+        ('2023-01-02T10:00:00', '2023-01-01T10:00:00', []),
+    ]
+)
+def test_get_nearest_era5_files(start_date, stop_date, expected_days):
+    files = get_nearest_era5_files(np.datetime64(start_date), np.datetime64(stop_date), ERA5_RESOURCE)
+    assert files == [ERA5_RESOURCE.replace('%Y%m%d', day) for day in expected_days]
+
+
+@pytest.mark.parametrize("resource", [ERA5_RESOURCE, '/era_5-copernicus__%Y%m%d%H.nc'])
+def test_get_nearest_era5_files_matches_per_minute_walk(resource):
+    """Same files as the per-minute walk of the research, with its last sample at `start + n minutes < stop`"""
+    from xsar.raster_readers import resource_strftime
+
+    def per_minute_walk(start_date, stop_date):
+        files = []
+        date = start_date
+        while date < stop_date:
+            filename = resource_strftime(resource, step=1, date=date.tolist())[1]
+            if filename not in files:
+                files.append(filename)
+            date += np.timedelta64(1, 'm')
+        return files
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        start_date = np.datetime64('2023-01-01T20:00:00', 'us') + np.timedelta64(rng.integers(0, 6 * 3600e6), 'us')
+        stop_date = start_date + np.timedelta64(rng.integers(0, 8 * 3600e6), 'us')
+        assert get_nearest_era5_files(start_date, stop_date, resource) == per_minute_walk(start_date, stop_date)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Small SAR archive tree, with hidden entries, a symlinked directory and files at intermediate levels"""
+    products = [
+        'sentinel-1a/L1/IW/GRD/2023/001/S1A_IW_GRDH_20230101T010203_20230101T010303.SAFE/a-owi-cm-20230101.nc',
+        'sentinel-1a/L1/EW/GRD/2023/001/S1A_EW_GRDM_20230101T100000_20230101T100100.SAFE/manifest.safe',
+        'sentinel-1a/L1/.hidden/GRD/2023/001/S1A_IW_GRDH_20230101T000000_20230101T000100.SAFE/manifest.safe',
+        'sentinel-1b/L1/IW/GRD/2023/002/S1B_IW_GRDH_20230102T010203_20230102T010303.SAFE/manifest.safe',
+        'sentinel-1b/L1/IW/GRD/2023/001/.S1B_IW_GRDH_20230101T010203_20230101T010303.SAFE/manifest.safe',
+    ]
+    for product in products:
+        path = tmp_path / product
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    # file where a directory level is expected
+    (tmp_path / 'sentinel-1a' / 'L1' / 'IW' / 'GRD' / '2023' / 'README').touch()
+    # symlinked directory, followed like glob does
+    os.symlink(tmp_path / 'sentinel-1a' / 'L1' / 'IW', tmp_path / 'sentinel-1b' / 'L1' / 'WV')
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "root, patterns",
+    [
+        ('sentinel-1*/L1', ['*', '*', '2023', '001', 'S1*20230101*SAFE']),
+        ('sentinel-1*/L1/', ['*', '*', '2023', '001', 'S1*20230101*SAFE']),
+        ('sentinel-1*/L1', ['*', '*', '2023', '001', 'S1*20230101*SAFE', '*owi*.nc']),
+        ('sentinel-1a/L1', ['*', '*', '2023', '*', '*']),
+        ('sentinel-1b/L1', ['*', '*', '2023', '001', '.S1*']),
+        ('sentinel-1a/L1', ['*', '*', '*', '*']),
+        ('*', ['L1']),
+        ('', ['*', 'L1', 'I?']),
+        ('missing*/L1', ['*']),
+        ('missing/L1', ['*']),
+    ]
+)
+def test_scan_levels_matches_glob(archive, root, patterns):
+    root_path = os.path.join(str(archive), root)
+    expected = glob.glob(os.path.join(root_path, *patterns))
+    assert sorted(_scan_levels(root_path, patterns)) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "lon_values",
+    [
+        # regular global grid, wrapping once after the shift
+        np.arange(0, 360, 0.25),
+        # regional grid, already sorted after the shift
+        np.arange(190, 200, 0.5),
+        np.arange(10, -180, -0.5),
+        np.array([170., 175., 180., 185., 170.]),
+        np.array([170., 175., np.nan, 185., 190.]),
+    ]
+)
+def test_correct_dataset_matches_sortby(lon_values):
+    dataset = xr.Dataset({'wind': ('lon', np.arange(len(lon_values), dtype=float))}, coords={'lon': lon_values})
+    # reference : shifted longitudes sorted with sortby
+    lon = dataset.lon
+    if (lon.max() - lon.min()) > 180:
+        lon = (lon + 180) % 360
+    expected = dataset.assign_coords(lon=lon - 180).sortby('lon')
+    xr.testing.assert_identical(correct_dataset(dataset), expected)